@@ -1,4 +1,5 @@
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image
 
 photo_path = "passport_photo.jpg"
 output_pdf = "passport_layout.pdf"
@@ -10,11 +11,11 @@ final_photo_size = (passport_px[0] + 2 * border, passport_px[1] + 2 * border)
 
 # 4x6 inch photo paper = 1200 × 1800 px
 layout_size = (1200, 1800)
-layout = Image.new("RGB", layout_size, "white")
-draw = ImageDraw.Draw(layout)
 
 # Load and crop to 3.5:4.5 portrait aspect ratio
 img = Image.open(photo_path)
+# Decode JPEGs at a reduced scale, keeping 2x the target size as headroom
+img.draft("RGB", (passport_px[0] * 2, passport_px[1] * 2))
 aspect_target = passport_px[0] / passport_px[1]
 img_aspect = img.width / img.height
 
@@ -22,15 +23,15 @@ if img_aspect > aspect_target:
     # crop width
     new_width = int(img.height * aspect_target)
     left = (img.width - new_width) // 2
-    img = img.crop((left, 0, left + new_width, img.height))
+    crop_box = (left, 0, left + new_width, img.height)
 else:
     # crop height
     new_height = int(img.width / aspect_target)
     top = (img.height - new_height) // 2
-    img = img.crop((0, top, img.width, top + new_height))
+    crop_box = (0, top, img.width, top + new_height)
 
-# Resize and add border
-resized = img.resize(passport_px)
+# Resize straight from the crop box (no intermediate cropped copy) and add border
+resized = img.resize(passport_px, box=crop_box)
 framed = Image.new("RGB", final_photo_size, "white")
 framed.paste(resized, (border, border))
 
@@ -39,20 +40,46 @@ rows, cols = 2, 3
 x_spacing = (layout_size[0] - (cols * final_photo_size[0])) // (cols + 1)
 y_spacing = (layout_size[1] - (rows * final_photo_size[1])) // (rows + 1)
 
+
+def fill_box(arr, x0, y0, x1, y1, color):
+    # Fill the half-open box [x0, x1) x [y0, y1), clipped to the canvas
+    arr[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] = color
+
+
+# Tile into a pre-allocated white canvas with NumPy slice assignment. Each
+# tile's outline is drawn right after the tile, so (as with paste + rectangle)
+# the next overlapping tile covers the part of it lying under that tile.
+framed_np = np.asarray(framed)
+layout_np = np.full((layout_size[1], layout_size[0], 3), 255, dtype=np.uint8)
+outline, line_w = (200, 200, 200), 2
+
 for row in range(rows):
     for col in range(cols):
         x = x_spacing + col * (final_photo_size[0] + x_spacing)
         y = y_spacing + row * (final_photo_size[1] + y_spacing)
-        layout.paste(framed, (x, y))
-        draw.rectangle([x, y, x + final_photo_size[0], y + final_photo_size[1]], outline=(200, 200, 200), width=2)
+        # Clip to the canvas like Image.paste does (3 columns overflow 4" width)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + final_photo_size[0], layout_size[0])
+        y1 = min(y + final_photo_size[1], layout_size[1])
+        layout_np[y0:y1, x0:x1] = framed_np[y0 - y:y1 - y, x0 - x:x1 - x]
+
+        # Same pixels as draw.rectangle([x, y, right, bottom], width=2):
+        # inclusive corners, outline drawn inward
+        right, bottom = x + final_photo_size[0], y + final_photo_size[1]
+        fill_box(layout_np, x, y, right + 1, y + line_w, outline)
+        fill_box(layout_np, x, bottom - line_w + 1, right + 1, bottom + 1, outline)
+        fill_box(layout_np, x, y, x + line_w, bottom + 1, outline)
+        fill_box(layout_np, right - line_w + 1, y, right + 1, bottom + 1, outline)
+
+layout = Image.fromarray(layout_np)
 
 layout.save(output_pdf, "PDF", resolution=300.0)
 print("✅ Output saved: passport_layout.pdf with 2x3 side-by-side layout.")
 
 
 # This script generates a passport layout with a specified photo size and saves it as a PDF.
-# Ensure you have the Pillow library installed to run this script.
-# You can install it using: pip install Pillow
+# Ensure you have the Pillow and NumPy libraries installed to run this script.
+# You can install them using: pip install Pillow numpy
 # Adjust the photo_path and output_pdf variables as needed.
 # The layout consists of 3 rows and 2 columns of passport photos with specified spacing.
 # The final PDF will be saved in the current working directory.
\ No newline at end of file
@@ -7,26 +7,49 @@ photo paper layout. The final output is a 300 DPI PDF file ready for printing.
 
 Usage:
     python generate_passport_layout_v2.py <input_photo_path> <output_pdf_path>
+    python generate_passport_layout_v2.py <input_photo_path>... <output_dir>
 
 Example:
     python generate_passport_layout_v2.py my_photo.jpg passport_sheet.pdf
+
+    # Batch mode: one <photo_stem>.pdf per photo, processed in parallel
+    python generate_passport_layout_v2.py mom.jpg dad.jpg kid.jpg sheets/
+
+Requirements:
+    pip install Pillow numpy
+
+    On x86-64 machines with AVX2, Pillow-SIMD is a drop-in replacement for
+    Pillow that vectorizes the resize step (it does not build on Apple Silicon):
+        pip uninstall -y Pillow
+        CC="cc -mavx2" pip install -U --force-reinstall pillow-simd
 """
 
 import argparse
+import io
 import sys
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image, ImageColor
 
 # --- Constants ---
 # Standard Indian passport photo size (3.5cm x 4.5cm) at 300 DPI
 PASSPORT_PHOTO_PX: Tuple[int, int] = (413, 531)
 ASPECT_RATIO: float = PASSPORT_PHOTO_PX[0] / PASSPORT_PHOTO_PX[1]
 
+# Largest source image accepted (~180 MB as RGB). Pillow also refuses to
+# open anything beyond twice this limit as a decompression bomb.
+MAX_SOURCE_PIXELS: int = 60_000_000
+Image.MAX_IMAGE_PIXELS = MAX_SOURCE_PIXELS
+
 # 4x6 inch photo paper at 300 DPI
 LAYOUT_PX: Tuple[int, int] = (1200, 1800)
 PDF_RESOLUTION: float = 300.0
+PDF_WRITE_BUFFER_BYTES: int = 1 << 20
+# Pillow embeds RGB pages as JPEG (DCTDecode); quality 75 is its default
+PDF_JPEG_QUALITY: int = 75
 
 # Layout configuration
 GRID_ROWS: int = 3
@@ -35,50 +58,188 @@ PHOTO_BORDER_PX: int = 20  # White border around each photo
 GUIDELINE_COLOR: str = "grey"
 GUIDELINE_WIDTH: int = 2
 DOTTED_LINE_GAP: int = 10
+GUIDELINE_RGB: Tuple[int, int, int] = ImageColor.getrgb(GUIDELINE_COLOR)
+
+# Derived layout geometry, computed once at import
+FINAL_PHOTO_SIZE: Tuple[int, int] = (
+    PASSPORT_PHOTO_PX[0] + 2 * PHOTO_BORDER_PX,
+    PASSPORT_PHOTO_PX[1] + 2 * PHOTO_BORDER_PX,
+)
+BLOCK_WIDTH: int = GRID_COLS * FINAL_PHOTO_SIZE[0]
+BLOCK_HEIGHT: int = GRID_ROWS * FINAL_PHOTO_SIZE[1]
+# Top-left corner of the photo block, centered on the canvas
+START_X: int = (LAYOUT_PX[0] - BLOCK_WIDTH) // 2
+START_Y: int = (LAYOUT_PX[1] - BLOCK_HEIGHT) // 2
+# (x0, y0, x1, y1) cutting guideline around each framed photo in the grid
+GUIDELINE_RECTS: Tuple[Tuple[int, int, int, int], ...] = tuple(
+    (
+        START_X + col * FINAL_PHOTO_SIZE[0],
+        START_Y + row * FINAL_PHOTO_SIZE[1],
+        START_X + (col + 1) * FINAL_PHOTO_SIZE[0],
+        START_Y + (row + 1) * FINAL_PHOTO_SIZE[1],
+    )
+    for row in range(GRID_ROWS)
+    for col in range(GRID_COLS)
+)
+
+# Crops snapped to an integer multiple of PASSPORT_PHOTO_PX are shrunk with
+# Image.reduce, a k x k box average (the same as OpenCV's INTER_AREA for
+# integer ratios). Crops that cannot be snapped are resized with the fallback
+# filter instead. A snap may trim at most MAX_SNAP_TRIM of the aspect-ratio
+# crop's width and height, so it never visibly changes the photo's framing.
+FALLBACK_RESIZE_FILTER: Image.Resampling = Image.Resampling.LANCZOS
+MAX_SNAP_TRIM: float = 0.03
+
+def _dash_pixels(
+    lo: np.ndarray, hi: np.ndarray, period: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expands a batch of [lo, hi) edge spans into the pixel positions of
+    their dashes, without a Python loop over edges or dashes.
+
+    Returns:
+        The positions along the edges, and the index of the edge each
+        position belongs to.
+    """
+    lengths = hi - lo
+    edge_idx = np.repeat(np.arange(len(lo)), lengths)
+    # Offset of each pixel from the start of its own edge
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    keep = offsets % period < period // 2
+    return (lo[edge_idx] + offsets)[keep], edge_idx[keep]
+
+
+def get_dotted_rectangle_pixels(
+    rects: np.ndarray,
+    width: int,
+    gap: int,
+    canvas_size: Tuple[int, int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the canvas pixels covered by dotted rectangle outlines.
+
+    Args:
+        rects: An (N, 4) integer array of (x0, y0, x1, y1) rectangles.
+        width: The line thickness in pixels.
+        gap: The spacing that, together with width, sets the dash period.
+        canvas_size: The (width, height) of the canvas. Pixels outside it
+            are dropped.
+
+    Returns:
+        A (rows, cols) pair of index arrays, so that
+        ``arr[rows, cols] = color`` draws every outline in one assignment.
+    """
+    period = width + gap
+    x0, y0, x1, y1 = np.asarray(rects, dtype=np.int64).T
+    thickness = np.arange(width) - width // 2
+
+    # Top and bottom edges
+    xs, edge = _dash_pixels(np.concatenate((x0, x0)), np.concatenate((x1, x1)), period)
+    ys = np.concatenate((y0, y1))[edge]
+    h_rows = (ys + thickness[:, None]).ravel()
+    h_cols = np.tile(xs, width)
+
+    # Left and right edges
+    ys, edge = _dash_pixels(np.concatenate((y0, y0)), np.concatenate((y1, y1)), period)
+    xs = np.concatenate((x0, x1))[edge]
+    v_rows = np.tile(ys, width)
+    v_cols = (xs + thickness[:, None]).ravel()
+
+    rows = np.concatenate((h_rows, v_rows))
+    cols = np.concatenate((h_cols, v_cols))
+    # Drop dash pixels that fall outside the canvas
+    keep = (
+        (rows >= 0) & (rows < canvas_size[1])
+        & (cols >= 0) & (cols < canvas_size[0])
+    )
+    return rows[keep], cols[keep]
 
-def draw_dotted_line(draw: ImageDraw.Draw, start_xy: Tuple[int, int], end_xy: Tuple[int, int], fill: str, width: int, gap: int):
-    """Draws a dotted line on the image."""
-    dist_x = end_xy[0] - start_xy[0]
-    dist_y = end_xy[1] - start_xy[1]
-    length = (dist_x**2 + dist_y**2)**0.5
-    num_dots = int(length / (width + gap))
-    for i in range(num_dots):
-        start_pos = (start_xy[0] + (dist_x * i / num_dots), start_xy[1] + (dist_y * i / num_dots))
-        end_pos = (start_xy[0] + (dist_x * (i + 0.5) / num_dots), start_xy[1] + (dist_y * (i + 0.5) / num_dots))
-        draw.line([start_pos, end_pos], fill=fill, width=width)
-
-def draw_dotted_rectangle(draw: ImageDraw.Draw, xy: list, outline: str, width: int, gap: int):
-    """Draws a dotted rectangle."""
-    x0, y0, x1, y1 = xy
-    draw_dotted_line(draw, (x0, y0), (x1, y0), outline, width, gap)
-    draw_dotted_line(draw, (x1, y0), (x1, y1), outline, width, gap)
-    draw_dotted_line(draw, (x1, y1), (x0, y1), outline, width, gap)
-    draw_dotted_line(draw, (x0, y1), (x0, y0), outline, width, gap)
-
-
-def crop_image_to_aspect_ratio(img: Image.Image, aspect_target: float) -> Image.Image:
+
+# Canvas pixels of the dotted cutting guidelines. They depend only on the
+# layout constants, so they are computed once at import and each sheet just
+# scatters GUIDELINE_RGB into them.
+GUIDELINE_PIXELS: Tuple[np.ndarray, np.ndarray] = get_dotted_rectangle_pixels(
+    GUIDELINE_RECTS, GUIDELINE_WIDTH, DOTTED_LINE_GAP, LAYOUT_PX
+)
+
+# White sheet with the cutting guidelines already drawn. Every layout shares
+# it, so each photo only copies it and fills in the photo regions.
+_sheet_template = np.full((LAYOUT_PX[1], LAYOUT_PX[0], 3), 255, dtype=np.uint8)
+_sheet_template[GUIDELINE_PIXELS] = GUIDELINE_RGB
+
+
+def get_crop_box_for_aspect_ratio(
+    size: Tuple[int, int],
+    aspect_target: float,
+    snap_px: Optional[Tuple[int, int]] = None,
+    max_snap_trim: float = MAX_SNAP_TRIM,
+) -> Tuple[Tuple[int, int, int, int], Optional[int]]:
     """
-    Crops the image to a target aspect ratio, cutting from the center.
+    Computes a centered crop box matching a target aspect ratio.
+
+    The box is passed to Image.resize rather than Image.crop, so the source
+    region is resampled in place without allocating a cropped copy.
 
     Args:
-        img: The source PIL Image object.
+        size: The (width, height) of the source image.
         aspect_target: The target aspect ratio (width / height).
+        snap_px: Optional target size with the same aspect ratio. When given,
+            the box is shrunk to the largest integer multiple of it that fits,
+            so a later resize to snap_px is an exact k:1 reduction.
+        max_snap_trim: The largest fraction of the box's width or height a
+            snap may remove. If snapping would trim more, the box is left
+            unsnapped.
 
     Returns:
-        The cropped PIL Image object.
+        The (left, top, right, bottom) crop box, and the reduction factor k
+        if the box was snapped to k * snap_px (None otherwise).
     """
-    img_aspect = img.width / img.height
+    width, height = size
+    snap_factor = None
 
-    if img_aspect > aspect_target:
+    if width / height > aspect_target:
         # Image is wider than target, crop width
-        new_width = int(img.height * aspect_target)
-        left = (img.width - new_width) // 2
-        return img.crop((left, 0, left + new_width, img.height))
+        new_width, new_height = int(height * aspect_target), height
     else:
         # Image is taller than target, crop height
-        new_height = int(img.width / aspect_target)
-        top = (img.height - new_height) // 2
-        return img.crop((0, top, img.width, top + new_height))
+        new_width, new_height = width, int(width / aspect_target)
+
+    if snap_px is not None:
+        k = min(new_width // snap_px[0], new_height // snap_px[1])
+        if (
+            k >= 1
+            and k * snap_px[0] >= (1 - max_snap_trim) * new_width
+            and k * snap_px[1] >= (1 - max_snap_trim) * new_height
+        ):
+            new_width, new_height = k * snap_px[0], k * snap_px[1]
+            snap_factor = k
+
+    left = (width - new_width) // 2
+    top = (height - new_height) // 2
+    return (left, top, left + new_width, top + new_height), snap_factor
+
+
+def render_layout_pdf(layout: Image.Image) -> io.BytesIO:
+    """
+    Encodes the layout as a PDF in memory.
+
+    Args:
+        layout: The finished 4x6 layout image.
+
+    Returns:
+        A BytesIO holding the PDF, so callers can stream or serve it
+        without touching disk.
+    """
+    buf = io.BytesIO()
+    layout.save(
+        buf,
+        "PDF",
+        resolution=PDF_RESOLUTION,
+        save_all=True,
+        quality=PDF_JPEG_QUALITY,
+        optimize=True,
+    )
+    return buf
 
 
 def create_photo_layout(
@@ -100,58 +261,84 @@ def create_photo_layout(
         print(f"❌ Error: Could not open image file. Reason: {e}")
         sys.exit(1)
 
-    print("📷 Cropping image to 3.5:4.5 aspect ratio...")
-    cropped_img = crop_image_to_aspect_ratio(source_img, ASPECT_RATIO)
+    # Image.open only reads the header, so reject oversized inputs before
+    # any pixel data is decoded
+    if source_img.width * source_img.height > MAX_SOURCE_PIXELS:
+        print(
+            f"❌ Error: Image is too large ({source_img.width}x{source_img.height}); "
+            f"the limit is {MAX_SOURCE_PIXELS:,} pixels."
+        )
+        sys.exit(1)
+
+    # Let libjpeg downscale during decode (1/2, 1/4 or 1/8) while keeping
+    # at least 2x the target size as headroom for the final resample
+    source_img.draft(
+        "RGB", (PASSPORT_PHOTO_PX[0] * 2, PASSPORT_PHOTO_PX[1] * 2)
+    )
 
-    # Resize to final passport photo pixel dimensions
-    resized_img = cropped_img.resize(PASSPORT_PHOTO_PX, Image.Resampling.LANCZOS)
+    # Image.reduce does not support palette, bilevel or 16-bit images
+    if source_img.mode != "RGB":
+        source_img = source_img.convert("RGB")
 
-    # Create a new image with a white border
-    final_photo_size = (
-        PASSPORT_PHOTO_PX[0] + 2 * PHOTO_BORDER_PX,
-        PASSPORT_PHOTO_PX[1] + 2 * PHOTO_BORDER_PX,
+    print("📷 Cropping image to 3.5:4.5 aspect ratio...")
+    crop_box, snap_factor = get_crop_box_for_aspect_ratio(
+        source_img.size, ASPECT_RATIO, snap_px=PASSPORT_PHOTO_PX
     )
-    framed_photo = Image.new("RGB", final_photo_size, "white")
-    framed_photo.paste(resized_img, (PHOTO_BORDER_PX, PHOTO_BORDER_PX))
 
-    # Create the 4x6 layout canvas
-    layout = Image.new("RGB", LAYOUT_PX, "white")
-    draw = ImageDraw.Draw(layout)
+    # Shrink the crop box straight to final passport photo pixel dimensions
+    if snap_factor is not None:
+        resized_img = source_img.reduce(snap_factor, box=crop_box)
+    else:
+        resized_img = source_img.resize(
+            PASSPORT_PHOTO_PX, FALLBACK_RESIZE_FILTER, box=crop_box
+        )
+
     print(f"📄 Creating {GRID_ROWS}x{GRID_COLS} layout on a 4x6 inch canvas...")
 
-    # Calculate the total size of the photo block
-    block_width = GRID_COLS * final_photo_size[0]
-    block_height = GRID_ROWS * final_photo_size[1]
-
-    # Calculate starting coordinates to center the block
-    start_x = (LAYOUT_PX[0] - block_width) // 2
-    start_y = (LAYOUT_PX[1] - block_height) // 2
-
-    # Paste photos onto the layout and draw cutting guidelines
-    for row in range(GRID_ROWS):
-        for col in range(GRID_COLS):
-            x = start_x + col * final_photo_size[0]
-            y = start_y + row * final_photo_size[1]
-            layout.paste(framed_photo, (x, y))
-            # Draw cutting guidelines around the framed photo
-            draw_dotted_rectangle(
-                draw,
-                [x, y, x + final_photo_size[0], y + final_photo_size[1]],
-                outline=GUIDELINE_COLOR,
-                width=GUIDELINE_WIDTH,
-                gap=DOTTED_LINE_GAP
-            )
+    # Start from the pre-drawn sheet. It is already white, so the photo's
+    # white border needs no pixels of its own. View the photo block as a
+    # (row, y, col, x) grid of frames and broadcast the photo into every
+    # frame's interior at once.
+    layout_arr = _sheet_template.copy()
+    frames = layout_arr[
+        START_Y:START_Y + BLOCK_HEIGHT, START_X:START_X + BLOCK_WIDTH
+    ].reshape(GRID_ROWS, FINAL_PHOTO_SIZE[1], GRID_COLS, FINAL_PHOTO_SIZE[0], 3)
+    frames[
+        :,
+        PHOTO_BORDER_PX:PHOTO_BORDER_PX + PASSPORT_PHOTO_PX[1],
+        :,
+        PHOTO_BORDER_PX:PHOTO_BORDER_PX + PASSPORT_PHOTO_PX[0],
+    ] = np.asarray(resized_img)[None, :, None]
+
+    layout = Image.fromarray(layout_arr)
 
     try:
-        layout.save(
-            output_path, "PDF", resolution=PDF_RESOLUTION, save_all=True
-        )
+        pdf_buf = render_layout_pdf(layout)
+        with open(output_path, "wb", buffering=PDF_WRITE_BUFFER_BYTES) as f:
+            f.write(pdf_buf.getbuffer())
         print(f"✅ Success! Output saved to: {output_path}")
     except Exception as e:
         print(f"❌ Error: Could not save PDF file. Reason: {e}")
         sys.exit(1)
 
 
+def _create_photo_layout_job(photo_path: Path, output_path: Path) -> bool:
+    """
+    Runs create_photo_layout in a worker process.
+
+    create_photo_layout exits on errors, and a SystemExit escaping a Pool
+    worker would leave its task unfinished, so it is turned into a result.
+
+    Returns:
+        True if the layout was saved, False otherwise.
+    """
+    try:
+        create_photo_layout(photo_path, output_path)
+    except SystemExit:
+        return False
+    return True
+
+
 def main():
     """Main function to parse arguments and run the script."""
     parser = argparse.ArgumentParser(
@@ -160,21 +347,46 @@ def main():
         epilog="""
 Example:
   python %(prog)s passport_photo.jpg passport_layout.pdf
+  python %(prog)s mom.jpg dad.jpg kid.jpg sheets/
 """
     )
     parser.add_argument(
         "input_photo",
         type=Path,
-        help="Path to the source passport photo (e.g., my_photo.jpg).",
+        nargs="+",
+        help="Path(s) to the source passport photo(s) (e.g., my_photo.jpg).",
     )
     parser.add_argument(
         "output_pdf",
         type=Path,
-        help="Path to save the output PDF file (e.g., passport_sheet.pdf).",
+        help=(
+            "Path to save the output PDF file (e.g., passport_sheet.pdf).\n"
+            "With several input photos, an existing directory that receives\n"
+            "one <photo_stem>.pdf per photo."
+        ),
     )
     args = parser.parse_args()
 
-    create_photo_layout(args.input_photo, args.output_pdf)
+    if len(args.input_photo) == 1:
+        create_photo_layout(args.input_photo[0], args.output_pdf)
+        return
+
+    if not args.output_pdf.is_dir():
+        parser.error(
+            f"with several input photos, '{args.output_pdf}' must be an existing directory"
+        )
+    output_paths = [args.output_pdf / f"{p.stem}.pdf" for p in args.input_photo]
+    if len(set(output_paths)) != len(output_paths):
+        parser.error("input photos must have distinct file names in batch mode")
+
+    # Each photo is an independent job, so spread them across CPU cores
+    jobs = list(zip(args.input_photo, output_paths))
+    with Pool(min(len(jobs), cpu_count())) as pool:
+        results = pool.starmap(_create_photo_layout_job, jobs)
+
+    if not all(results):
+        print(f"❌ {results.count(False)} of {len(jobs)} layouts failed.")
+        sys.exit(1)
 
 
 if __name__ == "__main__":